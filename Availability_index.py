@@ -0,0 +1,189 @@
+from bisect import bisect_left
+from datetime import time
+from heapq import merge
+
+import numpy as np
+
+from Semester_calendar import split_rooms, weekday_index, weekly_events_from_scheduler, weekly_events_from_student_timetable
+
+RESOURCE_KINDS = ('batch', 'room', 'faculty')
+# Placeholder names in the static data that do not identify a real room or person
+UNASSIGNED = {'', 'TBA', 'Various'}
+
+
+def _minutes(value):
+    """'14:00', time(14, 0) or minutes since midnight -> minutes since midnight"""
+    if isinstance(value, str):
+        value = time.fromisoformat(value)
+    if isinstance(value, time):
+        return value.hour * 60 + value.minute
+    return int(value)
+
+
+def _clock(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _window(start, end):
+    """Validate a query window and return it in minutes"""
+    start, end = _minutes(start), _minutes(end)
+    if end <= start:
+        raise ValueError(f"Query window must end after it starts, got {_clock(start)}-{_clock(end)}")
+    return start, end
+
+
+def _merge_intervals(intervals):
+    """Sorted (start, end) pairs -> disjoint, sorted busy intervals"""
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class AvailabilityIndex:
+    def __init__(self, weekly_events, rooms=None, day_start='09:00', day_end='18:30'):
+        """
+        Per-resource interval index over a repeating week.
+
+        - weekly_events: event dicts as produced by Semester_calendar.weekly_events_from_*
+        - rooms: optional {room: {'capacity', 'lab', 'projector'}} used by free_rooms
+        - day_start, day_end: bounds of the teaching day for free-window queries
+
+        Busy intervals are merged and stored as sorted start/end arrays per
+        (kind, name, weekday), so point checks are a single binary search.
+        Batches are only busy for courses they are enrolled in; rooms and
+        faculty are busy for every row.
+        """
+        self.day_start = _minutes(day_start)
+        self.day_end = _minutes(day_end)
+        self.rooms = rooms or {}
+
+        raw = {}
+        for event in weekly_events:
+            interval = (_minutes(event['start']), _minutes(event['end']))
+            batches = [event['batch']] if event.get('enrolled', True) else []
+            names = {'batch': batches, 'room': split_rooms(event['room']), 'faculty': [event['faculty']]}
+            for kind in RESOURCE_KINDS:
+                for name in names[kind]:
+                    name = name.strip()
+                    if name not in UNASSIGNED:
+                        raw.setdefault((kind, name), {}).setdefault(event['weekday'], []).append(interval)
+        for room in self.rooms:
+            raw.setdefault(('room', room), {})
+
+        self.index = {}
+        for resource, days in raw.items():
+            self.index[resource] = {}
+            for weekday, intervals in days.items():
+                merged = _merge_intervals(sorted(intervals))
+                self.index[resource][weekday] = (np.array([s for s, _ in merged]), np.array([e for _, e in merged]))
+
+        # Rooms sorted by capacity so capacity filters are a binary search
+        sized = sorted((props.get('capacity', 0), room) for room, props in self.rooms.items())
+        self._capacities = [capacity for capacity, _ in sized]
+        self._rooms_by_capacity = [room for _, room in sized]
+
+    @classmethod
+    def from_student_timetable(cls, student_tt, **kwargs):
+        kwargs.setdefault('rooms', getattr(student_tt, 'rooms', None))
+        return cls(weekly_events_from_student_timetable(student_tt), **kwargs)
+
+    @classmethod
+    def from_scheduler(cls, sched):
+        rooms = {
+            name: {'capacity': int(capacity), 'lab': bool(is_lab), 'projector': bool(has_projector)}
+            for name, (capacity, is_lab, has_projector, has_ac) in zip(sched.room_names, sched.room_properties)
+        }
+        return cls(weekly_events_from_scheduler(sched), rooms=rooms, day_end=_clock(9 * 60 + sched.slots * 30))
+
+    def resources(self, kind):
+        return sorted(name for k, name in self.index if k == kind)
+
+    def _busy(self, kind, name, day):
+        if (kind, name) not in self.index:
+            raise KeyError(f"Unknown {kind}: {name!r}")
+        empty = (np.array([], dtype=int), np.array([], dtype=int))
+        return self.index[(kind, name)].get(weekday_index(day), empty)
+
+    def busy(self, kind, name, day):
+        """Merged busy windows for one resource on one weekday, as ('HH:MM', 'HH:MM') pairs"""
+        starts, ends = self._busy(kind, name, day)
+        return [(_clock(s), _clock(e)) for s, e in zip(starts, ends)]
+
+    def is_free(self, kind, name, day, start, end):
+        """True if the resource has nothing booked overlapping [start, end)"""
+        start, end = _window(start, end)
+        starts, ends = self._busy(kind, name, day)
+        i = np.searchsorted(ends, start, side='right')
+        return bool(i == len(starts) or starts[i] >= end)
+
+    def _free_windows(self, busy, min_minutes):
+        windows = []
+        cursor = self.day_start
+        for start, end in busy:
+            gap_end = min(start, self.day_end)
+            if gap_end - cursor >= max(min_minutes, 1):
+                windows.append((_clock(cursor), _clock(gap_end)))
+            cursor = max(cursor, end)
+            if cursor >= self.day_end:
+                break
+        if self.day_end - cursor >= max(min_minutes, 1):
+            windows.append((_clock(cursor), _clock(self.day_end)))
+        return windows
+
+    def free_windows(self, kind, name, day, min_minutes=0):
+        """Free windows of at least min_minutes within the teaching day"""
+        starts, ends = self._busy(kind, name, day)
+        first = np.searchsorted(ends, self.day_start, side='right')
+        return self._free_windows(zip(starts[first:], ends[first:]), min_minutes)
+
+    def common_free_windows(self, resources, day, min_minutes=0):
+        """Windows when every (kind, name) in resources is free at the same time"""
+        busy = [zip(*self._busy(kind, name, day)) for kind, name in resources]
+        return self._free_windows(merge(*busy), min_minutes)
+
+    def free_rooms(self, day, start, end, min_capacity=0, projector=False, lab=False):
+        """Rooms free for [start, end) that meet the capacity and equipment filters.
+
+        Filtered results come from rooms with known properties, smallest first;
+        filtering an index built without room properties raises ValueError.
+        """
+        _window(start, end)
+        if min_capacity or projector or lab:
+            if not self.rooms:
+                raise ValueError("Room filters need room properties; build the index with rooms=...")
+            candidates = self._rooms_by_capacity[bisect_left(self._capacities, min_capacity):]
+        else:
+            candidates = self.resources('room')
+        return [
+            room for room in candidates
+            if (not projector or self.rooms[room]['projector'])
+            and (not lab or self.rooms[room]['lab'])
+            and self.is_free('room', room, day, start, end)
+        ]
+
+    def bulk_is_free(self, queries):
+        """
+        Answer many (kind, name, day, start, end) checks at once.
+
+        Queries on the same resource and weekday share one vectorized binary search.
+        Returns a list of booleans in query order.
+        """
+        groups = {}
+        for i, (kind, name, day, start, end) in enumerate(queries):
+            groups.setdefault((kind, name, weekday_index(day)), []).append((i,) + _window(start, end))
+
+        answers = [True] * len(queries)
+        for (kind, name, day), items in groups.items():
+            starts, ends = self._busy(kind, name, day)
+            positions, q_starts, q_ends = (np.array(column) for column in zip(*items))
+            i = np.searchsorted(ends, q_starts, side='right')
+            hit = i < len(starts)
+            free = ~hit
+            free[hit] = starts[i[hit]] >= q_ends[hit]
+            for position, ok in zip(positions, free):
+                answers[position] = bool(ok)
+        return answers
@@ -0,0 +1,63 @@
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from Streamlit_app import TimetableScheduler
+
+
+def build_scheduler(rooms, candidate_search, large_instance, seed=1):
+    """Scheduler with `rooms` rooms cycling through the four base room types, so every course has many suitable rooms"""
+    sched = TimetableScheduler(rooms=4, faculties=40, courses=6, groups=40, slots_per_day=20, seed=seed,
+                               large_instance=large_instance, candidate_search=candidate_search)
+    sched.num_rooms = rooms
+    sched.room_properties = np.resize(sched.room_properties, (rooms, 4))
+    sched.room_names = [f"R{i + 1:04d}" for i in range(rooms)]
+    sched.schedule = np.zeros((sched.days, sched.slots, rooms), dtype=int)
+    sched._build_room_index()
+    return sched
+
+
+def place_sessions(sched, requests):
+    """Select and schedule a slot for each (faculty, group, course) request; returns the number placed"""
+    placed = 0
+    for faculty_idx, group_idx, course_idx in requests:
+        duration = int(sched.course_requirements[course_idx][0])
+        slot = sched.select_slot(faculty_idx, group_idx, course_idx, duration)
+        if slot:
+            sched.schedule_class(faculty_idx, group_idx, course_idx, *slot, duration)
+            placed += 1
+    return placed
+
+
+def run(rooms, candidate_search, large_instance, placements=300):
+    """Returns ms per placement, peak KiB allocated while placing, and sessions placed.
+
+    Time and memory are measured on separate identical runs, since tracing
+    allocations slows the search down.
+    """
+    requests = np.random.default_rng(0).integers(0, [40, 40, 6], size=(placements, 3)).tolist()
+
+    sched = build_scheduler(rooms, candidate_search, large_instance)
+    start = time.perf_counter()
+    placed = place_sessions(sched, requests)
+    elapsed = time.perf_counter() - start
+
+    sched = build_scheduler(rooms, candidate_search, large_instance)
+    tracemalloc.start()
+    place_sessions(sched, requests)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / placements * 1000, peak / 1024, placed
+
+
+if __name__ == "__main__":
+    room_counts = [int(arg) for arg in sys.argv[1:]] or [40, 400, 2000]
+    print(f"{'mode':<8}{'rooms':>7}  {'search':<12}{'ms/placement':>14}{'peak KiB':>11}{'placed':>8}")
+    for large_instance in (False, True):
+        for rooms in room_counts:
+            for candidate_search in TimetableScheduler.CANDIDATE_SEARCH_MODES:
+                ms, peak, placed = run(rooms, candidate_search, large_instance)
+                mode = 'large' if large_instance else 'default'
+                print(f"{mode:<8}{rooms:>7}  {candidate_search:<12}{ms:>14.3f}{peak:>11.0f}{placed:>8}")
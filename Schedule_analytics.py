@@ -0,0 +1,94 @@
+import numpy as np
+
+
+def faculty_occupancy(schedule, num_faculties):
+    """[Faculties × Days × Slots] boolean matrix of teaching slots decoded from the schedule.
+
+    The schedule marks each occupied (day, slot, room) cell with faculty_idx + 100,
+    so scattering the occupied cells recovers who teaches when without any
+    temporary larger than the schedule itself.
+    """
+    occupancy = np.zeros((num_faculties,) + schedule.shape[:2], dtype=bool)
+    days, slots, rooms = np.nonzero(schedule)
+    occupancy[schedule[days, slots, rooms] - 100, days, slots] = True
+    return occupancy
+
+
+def idle_gap_stats(occupancy):
+    """
+    Idle-gap statistics for an [Entities × Days × Slots] occupancy matrix.
+
+    A gap is a run of free slots between the first and last class of a day.
+    Returns per-entity-per-day idle slots and gap counts, both [Entities × Days].
+    """
+    occ = occupancy.astype(bool)
+    num_slots = occ.shape[-1]
+    busy = occ.sum(axis=-1)
+    active = busy > 0
+
+    first = np.argmax(occ, axis=-1)
+    last = num_slots - 1 - np.argmax(occ[..., ::-1], axis=-1)
+    span = np.where(active, last - first + 1, 0)
+
+    # Runs of busy slots start wherever a slot is busy and the previous one is not
+    starts = occ & ~np.concatenate([np.zeros_like(occ[..., :1]), occ[..., :-1]], axis=-1)
+    runs = starts.sum(axis=-1)
+
+    return {
+        'idle_slots': span - busy,
+        'gap_count': np.where(active, runs - 1, 0),
+    }
+
+
+def compute_schedule_analytics(schedule, group_schedule, num_faculties, slot_hours=0.5):
+    """
+    Compute all dashboard/report metrics from the schedule matrices in one pass.
+
+    - schedule: [Days × Slots × Rooms], 0 = free, faculty_idx + 100 = occupied
+    - group_schedule: [Groups × Days × Slots], 1 = group is in class
+    - num_faculties: number of faculty codes that can appear in the schedule
+    - slot_hours: length of one slot in hours (default 0.5 = 30 min)
+
+    Utilization values are fractions of the weekly slot grid and account for
+    class duration, since every occupied slot of a session is counted.
+    peak_at is the (day, slot) of peak concurrency, or None if nothing is scheduled.
+    """
+    days, slots, _ = schedule.shape
+    week_slots = days * slots
+
+    room_occ = schedule > 0                                        # Days × Slots × Rooms
+    fac_occ = faculty_occupancy(schedule, num_faculties)           # Faculties × Days × Slots
+    grp_occ = group_schedule > 0                                   # Groups × Days × Slots
+
+    room_slots = room_occ.sum(axis=(0, 1))
+    faculty_slots = fac_occ.sum(axis=(1, 2))
+    group_slots = grp_occ.sum(axis=(1, 2))
+
+    # Load curve: rooms in use at each (day, slot)
+    concurrency = room_occ.sum(axis=2)
+    peak_day, peak_slot = np.unravel_index(np.argmax(concurrency), concurrency.shape)
+    peak = int(concurrency[peak_day, peak_slot])
+
+    faculty_gaps = idle_gap_stats(fac_occ)
+    group_gaps = idle_gap_stats(grp_occ)
+
+    return {
+        'slot_hours': slot_hours,
+        'occupied_slots': int(room_slots.sum()),
+        'total_slots': int(schedule.size),
+        'overall_utilization': float(room_slots.sum() / schedule.size),
+        'room_slots': room_slots,
+        'room_utilization': room_slots / week_slots,
+        'faculty_hours': faculty_slots * slot_hours,
+        'faculty_utilization': faculty_slots / week_slots,
+        'group_hours': group_slots * slot_hours,
+        'group_utilization': group_slots / week_slots,
+        'day_load': concurrency,
+        'daily_hours': concurrency.sum(axis=1) * slot_hours,
+        'peak_concurrency': peak,
+        'peak_at': (int(peak_day), int(peak_slot)) if peak else None,
+        'faculty_idle_slots': faculty_gaps['idle_slots'],
+        'faculty_gap_count': faculty_gaps['gap_count'],
+        'group_idle_slots': group_gaps['idle_slots'],
+        'group_gap_count': group_gaps['gap_count'],
+    }
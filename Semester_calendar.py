@@ -0,0 +1,187 @@
+import csv
+import hashlib
+from datetime import datetime, time, timedelta, timezone
+
+WEEKDAYS = {'MON': 0, 'TUE': 1, 'WED': 2, 'THU': 3, 'FRI': 4, 'SAT': 5, 'SUN': 6}
+
+
+def weekday_index(day):
+    """'MON', 'Monday', 'mon' ... or a 0-based weekday index -> 0..6"""
+    return WEEKDAYS[day[:3].upper()] if isinstance(day, str) else int(day)
+
+
+def split_rooms(room):
+    """'C205, L102' -> ['C205', 'L102']; the one place room lists are parsed"""
+    return [name.strip() for name in room.split(',') if name.strip()]
+
+
+def _slot_time(slot):
+    """Scheduler slot index -> time of day (slot 0 = 09:00, 30-min slots)"""
+    return time(9 + slot // 2, 0 if slot % 2 == 0 else 30)
+
+
+def weekly_events_from_student_timetable(student_tt):
+    """Normalize StudentTimetable.timetable into weekly event dicts.
+
+    Every row is kept, since rooms and faculty are booked whether or not the
+    batch is enrolled; 'enrolled' marks rows whose course the batch takes,
+    as get_student_timetable would list them.
+    """
+    events = []
+    for day, start, end, code, batch in student_tt.timetable:
+        course_code = code.split()[0]
+        course = student_tt.courses.get(course_code, {})
+        events.append({
+            'weekday': weekday_index(day),
+            'start': time.fromisoformat(start),
+            'end': time.fromisoformat(end),
+            'code': code,
+            'course': course.get('name', 'Unknown'),
+            'batch': batch,
+            'room': course.get('room', 'TBA'),
+            'faculty': course.get('faculty', 'TBA'),
+            'enrolled': course_code in student_tt.students.get(batch, ()),
+        })
+    return events
+
+
+def weekly_events_from_scheduler(sched):
+    """Normalize TimetableScheduler.scheduled_classes into weekly event dicts"""
+    events = []
+    for cls in sched.scheduled_classes:
+        events.append({
+            'weekday': weekday_index(cls['day']),
+            'start': _slot_time(cls['start_slot']),
+            'end': _slot_time(cls['start_slot'] + cls['duration']),
+            'code': cls['course'],
+            'course': cls['course'],
+            'batch': cls['group'],
+            'room': cls['room'],
+            'faculty': cls['faculty'],
+            'enrolled': True,
+        })
+    return events
+
+
+class SemesterCalendar:
+    def __init__(self, start, end, holidays=(), exam_weeks=()):
+        """
+        Expand a repeating week into dated occurrences across a semester.
+
+        - start, end: first and last teaching date (inclusive)
+        - holidays: dates with no classes
+        - exam_weeks: any date inside each exam week; the whole Monday-Sunday week is skipped
+        """
+        self.start = start
+        self.end = end
+        self.excluded = set(holidays)
+        for day in exam_weeks:
+            monday = day - timedelta(days=day.weekday())
+            self.excluded.update(monday + timedelta(days=i) for i in range(7))
+
+    def is_teaching_day(self, day):
+        return self.start <= day <= self.end and day not in self.excluded
+
+    def occurrences(self, weekly_events, start=None, end=None, batch=None, room=None, faculty=None,
+                    enrolled_only=False):
+        """
+        Generate dated occurrences in date, then start-time order.
+
+        Events are filtered by batch/room/faculty before expansion and only dates in
+        [start, end] (clipped to the semester) are visited, so a narrow query costs
+        only what it returns. Nothing is materialized beyond the weekly events.
+        enrolled_only drops rows for courses the batch is not enrolled in, for
+        per-batch feeds that should match get_student_timetable.
+        """
+        by_weekday = {}
+        for event in weekly_events:
+            if enrolled_only and not event.get('enrolled', True):
+                continue
+            if batch is not None and event['batch'] != batch:
+                continue
+            if room is not None and room.strip() not in split_rooms(event['room']):
+                continue
+            if faculty is not None and event['faculty'] != faculty:
+                continue
+            by_weekday.setdefault(event['weekday'], []).append(event)
+        for events in by_weekday.values():
+            events.sort(key=lambda e: e['start'])
+
+        day = max(start or self.start, self.start)
+        last = min(end or self.end, self.end)
+        while day <= last:
+            if day not in self.excluded:
+                for event in by_weekday.get(day.weekday(), ()):
+                    yield {
+                        'date': day,
+                        'start': datetime.combine(day, event['start']),
+                        'end': datetime.combine(day, event['end']),
+                        'code': event['code'],
+                        'course': event['course'],
+                        'batch': event['batch'],
+                        'room': event['room'],
+                        'faculty': event['faculty'],
+                    }
+            day += timedelta(days=1)
+
+
+CSV_COLUMNS = ['Date', 'Start', 'End', 'Code', 'Course', 'Batch', 'Room', 'Faculty']
+
+
+def write_occurrences_csv(occurrences, stream):
+    """Write occurrences to an open text stream one row at a time; returns the row count"""
+    writer = csv.writer(stream)
+    writer.writerow(CSV_COLUMNS)
+    count = 0
+    for occ in occurrences:
+        writer.writerow([occ['date'].isoformat(), occ['start'].strftime('%H:%M'), occ['end'].strftime('%H:%M'),
+                         occ['code'], occ['course'], occ['batch'], occ['room'], occ['faculty']])
+        count += 1
+    return count
+
+
+def _ics_text(value):
+    return str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def _ics_fold(line):
+    """Fold a content line at 75 octets of UTF-8 as required by RFC 5545, never inside a character"""
+    parts = []
+    current, size = '', 0
+    for char in line:
+        octets = len(char.encode('utf-8'))
+        if size + octets > 75:
+            parts.append(current)
+            current, size = ' ', 1
+        current += char
+        size += octets
+    parts.append(current)
+    return '\r\n'.join(parts) + '\r\n'
+
+
+def write_occurrences_ics(occurrences, stream, calendar_name='Timetable'):
+    """Write occurrences to an open text stream as an iCalendar feed; returns the event count"""
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    stream.write(_ics_fold('BEGIN:VCALENDAR'))
+    stream.write(_ics_fold('VERSION:2.0'))
+    stream.write(_ics_fold('PRODID:-//Time-Table//Semester Calendar//EN'))
+    stream.write(_ics_fold(f'X-WR-CALNAME:{_ics_text(calendar_name)}'))
+    count = 0
+    for occ in occurrences:
+        key = f"{occ['start'].isoformat()}|{occ['code']}|{occ['batch']}|{occ['room']}"
+        uid = hashlib.sha1(key.encode()).hexdigest()
+        for line in (
+            'BEGIN:VEVENT',
+            f'UID:{uid}@time-table',
+            f'DTSTAMP:{stamp}',
+            f"DTSTART:{occ['start'].strftime('%Y%m%dT%H%M%S')}",
+            f"DTEND:{occ['end'].strftime('%Y%m%dT%H%M%S')}",
+            f"SUMMARY:{_ics_text(occ['code'] + ' - ' + occ['course'])}",
+            f"LOCATION:{_ics_text(occ['room'])}",
+            f"DESCRIPTION:{_ics_text(occ['batch'] + ' / ' + occ['faculty'])}",
+            'END:VEVENT',
+        ):
+            stream.write(_ics_fold(line))
+        count += 1
+    stream.write(_ics_fold('END:VCALENDAR'))
+    return count
@@ -2,7 +2,14 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time, timedelta
+from io import StringIO
+from itertools import islice
+
+from Availability_index import AvailabilityIndex
+from Schedule_analytics import compute_schedule_analytics
+from Semester_calendar import SemesterCalendar, weekly_events_from_student_timetable, write_occurrences_csv, write_occurrences_ics
 
 class StudentTimetable:
     def __init__(self):
@@ -23,6 +30,18 @@ class StudentTimetable:
             "CS307": {"name": "Machine Learning", "room": "C104", "faculty": "Dr. Utkarsh Mahadeo Khaire"},
         }
 
+        # Room facilities used by availability queries
+        self.rooms = {
+            "C002": {"capacity": 120, "lab": False, "projector": True},
+            "C004": {"capacity": 60, "lab": False, "projector": True},
+            "C101": {"capacity": 60, "lab": False, "projector": True},
+            "C103": {"capacity": 40, "lab": False, "projector": True},
+            "C104": {"capacity": 40, "lab": False, "projector": False},
+            "C205": {"capacity": 60, "lab": False, "projector": True},
+            "L102": {"capacity": 30, "lab": True, "projector": True},
+            "L201": {"capacity": 40, "lab": True, "projector": True},
+        }
+
         # Define multiple student batches with their courses
         self.students = {
             "Batch A": ["E1", "D1", "B1", "C1", "C2", "D2"],
@@ -95,33 +114,65 @@ class StudentTimetable:
         return df[["Day", "Start", "End", "Code", "Course", "Room", "Faculty"]]
 
 
+def index_label(i):
+    """Spreadsheet-style label for a zero-based index: A..Z, AA..AZ, BA.. and so on"""
+    label = ''
+    i += 1
+    while i > 0:
+        i, rem = divmod(i - 1, 26)
+        label = chr(65 + rem) + label
+    return label
+
+
 class TimetableScheduler:
-    def __init__(self, days=5, slots_per_day=12, rooms=4, faculties=4, courses=6, groups=3, seed=None):
+    # How generate_timetable picks a placement for each session:
+    # - 'exhaustive': list every valid slot, then choose one uniformly
+    # - 'reservoir': draw one slot uniformly from per-cell free-room counts (no list, no room mask)
+    # - 'first_k': scan (day, start_slot, room) in random order, stop after candidate_k valid slots
+    #   and choose among those
+    CANDIDATE_SEARCH_MODES = ('exhaustive', 'reservoir', 'first_k')
+
+    def __init__(self, days=5, slots_per_day=12, rooms=4, faculties=4, courses=6, groups=3, seed=None,
+                 large_instance=False, candidate_search='exhaustive', candidate_k=8):
+        if candidate_search not in self.CANDIDATE_SEARCH_MODES:
+            raise ValueError(f"candidate_search must be one of {self.CANDIDATE_SEARCH_MODES}, got {candidate_search!r}")
+        if candidate_k < 1:
+            raise ValueError(f"candidate_k must be at least 1, got {candidate_k!r}")
         self.days = days
         self.slots = slots_per_day
         self.num_rooms = rooms
         self.num_faculties = faculties
         self.num_courses = courses
         self.num_groups = groups
+        # Large-instance mode searches one room per equivalence class instead of every room
+        self.large_instance = large_instance
+        self.candidate_search = candidate_search
+        self.candidate_k = candidate_k
 
-        if seed is not None:
-            np.random.seed(seed)
-            random.seed(seed)
+        # Each scheduler owns its generator so concurrent instances never share a stream
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
 
         self.day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'][:days]
-        self.room_names = [f'Room {chr(65+i)}' for i in range(rooms)]
-        self.faculty_names = [f'Dr. {chr(65+i)}' for i in range(faculties)]
+        self.room_names = [f'Room {index_label(i)}' for i in range(rooms)]
+        self.faculty_names = [f'Dr. {index_label(i)}' for i in range(faculties)]
         self.course_names = [f'Course {i+1}' for i in range(courses)]
-        self.group_names = [f'Batch {chr(65+i)}' for i in range(groups)]
+        self.group_names = [f'Batch {index_label(i)}' for i in range(groups)]
 
         self._initialize_matrices()
 
     def _initialize_matrices(self):
         self.schedule = np.zeros((self.days, self.slots, self.num_rooms), dtype=int)
+        self.group_schedule = np.zeros((self.num_groups, self.days, self.slots), dtype=int)
+        self.faculty_schedule = np.zeros((self.num_faculties, self.days, self.slots), dtype=int)
+        self._analytics = None
+        self._availability = None
+        self._room_window_cache = {}
+        self._class_free = {}
         # Increase faculty availability to 90%
-        self.faculty_availability = np.random.choice([0, 1], size=(self.num_faculties, self.days, self.slots), p=[0.1, 0.9])
+        self.faculty_availability = self.rng.choice([0, 1], size=(self.num_faculties, self.days, self.slots), p=[0.1, 0.9])
         # Increase group availability to 95%
-        self.group_availability = np.random.choice([0, 1], size=(self.num_groups, self.days, self.slots), p=[0.05, 0.95])
+        self.group_availability = self.rng.choice([0, 1], size=(self.num_groups, self.days, self.slots), p=[0.05, 0.95])
 
         base_rooms = np.array([
             [60, 0, 1, 1],
@@ -149,62 +200,198 @@ class TimetableScheduler:
             extra = np.tile(base_courses[-1], (self.num_courses - base_courses.shape[0], 1))
             self.course_requirements = np.vstack([base_courses, extra])[:self.num_courses]
 
+        self._build_room_index()
+
         # Increase faculty-course mapping to 80%
-        self.faculty_course_mapping = np.random.choice([0, 1], size=(self.num_faculties, self.num_courses), p=[0.2, 0.8])
+        self.faculty_course_mapping = self.rng.choice([0, 1], size=(self.num_faculties, self.num_courses), p=[0.2, 0.8])
         for c in range(self.num_courses):
             if self.faculty_course_mapping[:, c].sum() == 0:
-                self.faculty_course_mapping[random.randint(0, self.num_faculties-1), c] = 1
+                self.faculty_course_mapping[self.rng.integers(self.num_faculties), c] = 1
 
-        self.course_group_needs = np.random.randint(2, 6, size=(self.num_courses, self.num_groups))
+        self.course_group_needs = self.rng.integers(2, 6, size=(self.num_courses, self.num_groups))
         self.faculty_workload = np.zeros(self.num_faculties)
         self.scheduled_classes = []
 
+    def _build_room_index(self):
+        # ROOM SUITABILITY: [Courses × Rooms] - True = room meets every course requirement
+        duration, needs_lab, needs_projector, min_capacity = self.course_requirements.T[:, :, None]
+        capacity, is_lab, has_projector, has_ac = self.room_properties.T[:, None, :]
+        self.room_suitability = (capacity >= min_capacity) & (is_lab >= needs_lab) & (has_projector >= needs_projector)
+
+        # ROOM CLASSES: rooms with identical properties are interchangeable for the search
+        _, self.room_class = np.unique(self.room_properties, axis=0, return_inverse=True)
+        self.room_class = self.room_class.ravel()
+        self.room_classes = [np.flatnonzero(self.room_class == k) for k in range(self.room_class.max() + 1)]
+        # CLASS SUITABILITY: [Courses × Room classes]
+        self.class_suitability = self.room_suitability[:, [members[0] for members in self.room_classes]]
+
     def check_room_suitable(self, room_idx, course_idx):
-        duration, needs_lab, needs_projector, min_capacity = self.course_requirements[course_idx]
-        capacity, is_lab, has_projector, has_ac = self.room_properties[room_idx]
-        return (capacity >= min_capacity) and (is_lab >= needs_lab) and (has_projector >= needs_projector)
+        return bool(self.room_suitability[course_idx, room_idx])
+
+    def _window_all(self, free, duration):
+        """For a boolean [..., Slots] array, whether every slot in each duration-long window is True"""
+        counts = np.cumsum(free, axis=-1)
+        counts = np.concatenate([np.zeros_like(counts[..., :1]), counts], axis=-1)
+        return (counts[..., duration:] - counts[..., :-duration]) == duration
+
+    def _room_windows(self, duration):
+        """[Days × Start slots × Rooms] - room free for the whole window; cached until the next placement"""
+        if duration not in self._room_window_cache:
+            free = self._window_all(np.moveaxis(self.schedule == 0, 2, 1), duration)
+            self._room_window_cache[duration] = np.moveaxis(free, 1, 2)
+        return self._room_window_cache[duration]
+
+    def _class_free_windows(self, duration):
+        """[Classes × Days × Start slots] - rooms of each class free for the whole window.
+
+        Built from the schedule the first time a duration is needed, then kept
+        up to date by schedule_class, so searches never rescan every room.
+        """
+        if duration not in self._class_free:
+            free = self._window_all(np.moveaxis(self.schedule == 0, 2, 1), duration)  # Days × Rooms × Starts
+            counts = np.zeros((len(self.room_classes), self.days, free.shape[2]), dtype=int)
+            np.add.at(counts, self.room_class, np.moveaxis(free, 1, 0))
+            self._class_free[duration] = counts
+        return self._class_free[duration]
+
+    def _free_members(self, room_class, duration, day, start_slot):
+        """Rooms of one class free for the whole window, in room order"""
+        members = self.room_classes[room_class]
+        busy = self.schedule[day, start_slot:start_slot+duration][:, members].any(axis=0)
+        return members[~busy]
+
+    def _class_candidates(self, faculty_idx, group_idx, course_idx, duration):
+        """(day, start_slot, room class) rows, one per suitable class with a free room, in that order"""
+        time_ok = self._time_ok(faculty_idx, group_idx, duration)
+        open_classes = (self._class_free_windows(duration) > 0) & self.class_suitability[course_idx][:, None, None]
+        return np.argwhere(np.moveaxis(open_classes & time_ok, 0, 2))
+
+    def _time_ok(self, faculty_idx, group_idx, duration):
+        """[Days × Start slots] - faculty and group both free and faculty not teaching elsewhere"""
+        faculty_free = self._window_all(self.faculty_availability[faculty_idx] == 1, duration)
+        group_free = self._window_all(self.group_availability[group_idx] == 1, duration)
+        not_teaching = self._window_all(self.faculty_schedule[faculty_idx] == 0, duration)
+        return faculty_free & group_free & not_teaching
 
     def find_valid_slots(self, faculty_idx, group_idx, course_idx, duration):
-        valid_slots = []
-        for day in range(self.days):
-            for start_slot in range(self.slots - duration + 1):
-                for room in range(self.num_rooms):
-                    if not self.check_room_suitable(room, course_idx):
-                        continue
-                    slot_range = slice(start_slot, start_slot + duration)
-                    
-                    # Check if room is free
-                    room_free = np.all(self.schedule[day, slot_range, room] == 0)
-                    if not room_free:
-                        continue
-                    
-                    # Check if faculty is available
-                    faculty_free = np.all(self.faculty_availability[faculty_idx, day, slot_range] == 1)
-                    if not faculty_free:
-                        continue
-                    
-                    # Check if group is free
-                    group_free = np.all(self.group_availability[group_idx, day, slot_range] == 1)
-                    if not group_free:
-                        continue
-                    
-                    # Check faculty is not teaching in another room at same time
-                    faculty_not_teaching = True
-                    for other_room in range(self.num_rooms):
-                        if other_room != room:
-                            if np.any(self.schedule[day, slot_range, other_room] == (faculty_idx + 100)):
-                                faculty_not_teaching = False
-                                break
-                    
-                    if faculty_not_teaching:
-                        valid_slots.append((day, start_slot, room))
-        return valid_slots
+        """Returns (day, start_slot, room) tuples ordered by day, slot and room.
+
+        In large-instance mode interchangeable rooms are collapsed: each room
+        class contributes only its first free room per (day, start_slot).
+        """
+        if self.large_instance:
+            slots = [(int(d), int(s), int(self._free_members(k, duration, d, s)[0]))
+                     for d, s, k in self._class_candidates(faculty_idx, group_idx, course_idx, duration)]
+            return sorted(slots)
+
+        time_ok = self._time_ok(faculty_idx, group_idx, duration)
+        if not time_ok.any():
+            return []
+        mask = self._room_windows(duration) & time_ok[:, :, None] & self.room_suitability[course_idx]
+        return [(int(d), int(s), int(r)) for d, s, r in np.argwhere(mask)]
+
+    def _cell_counts(self, faculty_idx, group_idx, course_idx, duration):
+        """[Days × Start slots] - number of valid slots find_valid_slots would list for each cell.
+
+        Computed from the per-class free-room counts, so no room is looked at.
+        In large-instance mode each open room class counts once.
+        """
+        counts = self._class_free_windows(duration)
+        if self.large_instance:
+            counts = (counts > 0).astype(int)
+        per_cell = np.tensordot(self.class_suitability[course_idx], counts, axes=1)
+        return per_cell * self._time_ok(faculty_idx, group_idx, duration)
+
+    def _feasible_rooms(self, course_idx, duration, day, start_slot):
+        """Rooms (one per room class in large-instance mode) free and suitable for this placement, sorted"""
+        open_classes = np.flatnonzero(self.class_suitability[course_idx]
+                                      & (self._class_free_windows(duration)[:, day, start_slot] > 0))
+        rooms = [self._free_members(k, duration, day, start_slot) for k in open_classes]
+        if self.large_instance:
+            rooms = [members[:1] for members in rooms]
+        return np.sort(np.concatenate(rooms)) if rooms else np.array([], dtype=int)
+
+    def _lazy_permutation(self, n):
+        """Yield range(n) in uniformly random order, drawing one position at a time (lazy Fisher-Yates)"""
+        swapped = {}
+        for i in range(n):
+            j = int(self.rng.integers(i, n))
+            yield swapped.get(j, j)
+            swapped[j] = swapped.get(i, i)
+
+    def iter_valid_slots(self, faculty_idx, group_idx, course_idx, duration, shuffled=False):
+        """Lazily yield the same (day, start_slot, room) tuples as find_valid_slots.
+
+        Valid slots are numbered cell by cell from the per-cell counts, and rooms are
+        only looked up for cells that are actually visited. With shuffled=True the
+        numbering is walked in a uniformly random order, so consecutive slots are
+        independent draws over (day, start_slot, room) rather than one cell at a time.
+        Consume the generator before scheduling another class.
+        """
+        counts = self._cell_counts(faculty_idx, group_idx, course_idx, duration).ravel()
+        starts = np.cumsum(counts) - counts
+        num_slots = self.slots - duration + 1
+        rooms = {}
+        order = self._lazy_permutation(int(counts.sum())) if shuffled else range(int(counts.sum()))
+        for position in order:
+            cell = int(np.searchsorted(starts, position, side='right')) - 1
+            if cell not in rooms:
+                rooms[cell] = self._feasible_rooms(course_idx, duration, *divmod(cell, num_slots))
+            yield divmod(cell, num_slots) + (int(rooms[cell][position - starts[cell]]),)
+
+    def select_slot(self, faculty_idx, group_idx, course_idx, duration):
+        """Pick one valid (day, start_slot, room) according to candidate_search, or None.
+
+        'exhaustive' and 'reservoir' both choose uniformly among all valid slots;
+        'first_k' is uniform only among the first candidate_k slots of a random scan.
+        """
+        if self.candidate_search == 'exhaustive' and self.large_instance:
+            # One candidate per (day, start_slot, room class); only the chosen class is searched for a room
+            candidates = self._class_candidates(faculty_idx, group_idx, course_idx, duration)
+            if not len(candidates):
+                return None
+            day, start_slot, room_class = (int(v) for v in candidates[self.rng.integers(len(candidates))])
+            return day, start_slot, int(self._free_members(room_class, duration, day, start_slot)[0])
+
+        if self.candidate_search == 'exhaustive':
+            valid_slots = self.find_valid_slots(faculty_idx, group_idx, course_idx, duration)
+            return valid_slots[self.rng.integers(len(valid_slots))] if valid_slots else None
+
+        if self.candidate_search == 'first_k':
+            stream = self.iter_valid_slots(faculty_idx, group_idx, course_idx, duration, shuffled=True)
+            first = list(islice(stream, self.candidate_k))
+            return first[self.rng.integers(len(first))] if first else None
+
+        # Pick a cell with probability proportional to its slot count, then one of its
+        # rooms uniformly, so every valid slot is chosen with probability 1/total.
+        counts = self._cell_counts(faculty_idx, group_idx, course_idx, duration)
+        total = int(counts.sum())
+        if not total:
+            return None
+        position = int(self.rng.integers(total))
+        ends = np.cumsum(counts)
+        cell = int(np.searchsorted(ends, position, side='right'))
+        day, start_slot = divmod(cell, counts.shape[1])
+        rooms = self._feasible_rooms(course_idx, duration, day, start_slot)
+        return day, start_slot, int(rooms[position - (ends[cell] - rooms.size)])
 
     def schedule_class(self, faculty_idx, group_idx, course_idx, day, start_slot, room, duration):
+        # Windows of this room that the placement takes away, for every tracked duration
+        was_free = self.schedule[day, :, room] == 0
+        now_free = was_free.copy()
+        now_free[start_slot:start_slot+duration] = False
+        for window, counts in self._class_free.items():
+            counts[self.room_class[room], day] -= self._window_all(was_free, window) & ~self._window_all(now_free, window)
+
         self.schedule[day, start_slot:start_slot+duration, room] = faculty_idx + 100
         self.faculty_availability[faculty_idx, day, start_slot:start_slot+duration] = 0
         self.group_availability[group_idx, day, start_slot:start_slot+duration] = 0
+        self.group_schedule[group_idx, day, start_slot:start_slot+duration] = 1
+        self.faculty_schedule[faculty_idx, day, start_slot:start_slot+duration] = 1
         self.faculty_workload[faculty_idx] += duration * 0.5
+        self._analytics = None
+        self._availability = None
+        self._room_window_cache = {}
         self.scheduled_classes.append({
             'faculty': self.faculty_names[faculty_idx],
             'group': self.group_names[group_idx],
@@ -232,7 +419,7 @@ class TimetableScheduler:
                 scheduling_tasks.append((course_idx, group_idx, sessions_needed, duration))
         
         # Shuffle tasks to avoid always prioritizing the same groups
-        random.shuffle(scheduling_tasks)
+        self.rng.shuffle(scheduling_tasks)
         
         for course_idx, group_idx, sessions_needed, duration in scheduling_tasks:
             eligible_faculty = np.where(self.faculty_course_mapping[:, course_idx] == 1)[0]
@@ -245,10 +432,10 @@ class TimetableScheduler:
             while scheduled_sessions < sessions_needed and attempts < max_attempts_per_session:
                 attempts += 1
                 faculty_idx = eligible_faculty[np.argmin(self.faculty_workload[eligible_faculty])]
-                valid_slots = self.find_valid_slots(faculty_idx, group_idx, course_idx, duration)
+                slot = self.select_slot(faculty_idx, group_idx, course_idx, duration)
                 
-                if valid_slots:
-                    day, start_slot, room = random.choice(valid_slots)
+                if slot is not None:
+                    day, start_slot, room = slot
                     self.schedule_class(faculty_idx, group_idx, course_idx, day, start_slot, room, duration)
                     scheduled_sessions += 1
                 else:
@@ -261,6 +448,18 @@ class TimetableScheduler:
 
     def matrix_for_day(self, day=0):
         return self.schedule[day]
+
+    def analytics(self):
+        """Utilization, load and gap metrics, computed once per schedule and cached"""
+        if self._analytics is None:
+            self._analytics = compute_schedule_analytics(self.schedule, self.group_schedule, self.num_faculties)
+        return self._analytics
+
+    def availability_index(self):
+        """Free-slot query index over the generated schedule, built once per schedule and cached"""
+        if self._availability is None:
+            self._availability = AvailabilityIndex.from_scheduler(self)
+        return self._availability
     
     def get_sorted_dataframe(self):
         """Returns a sorted DataFrame with proper day and time ordering"""
@@ -284,6 +483,83 @@ class TimetableScheduler:
         return df[['day', 'start_time', 'end_time', 'course', 'group', 'faculty', 'room']]
 
 
+def _run_scheduler(seed, params):
+    sched = TimetableScheduler(seed=seed, **params)
+    sched.generate_timetable()
+    return sched
+
+
+def generate_many(seeds, max_workers=None, **params):
+    """Generate one timetable per seed in a thread pool.
+
+    Every scheduler draws from its own generator, so the result for a given
+    seed is identical whether it runs alone or alongside other instances.
+    Returns the generated schedulers in the same order as ``seeds``.
+    """
+    seeds = list(seeds)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda seed: _run_scheduler(seed, params), seeds))
+
+
+@st.cache_resource
+def load_static_availability():
+    """The static timetable never changes, so its index is built once per server process"""
+    return AvailabilityIndex.from_student_timetable(StudentTimetable())
+
+
+def render_availability_queries(index, day_labels, panel, key):
+    """Free-time query widgets over an AvailabilityIndex; controls go in panel (st or st.sidebar)"""
+    query = panel.radio('Query', ['Common free time', 'Free rooms', 'Free windows'], key=f'{key}_query')
+    day = panel.selectbox('Day', day_labels, key=f'{key}_day')
+
+    if query == 'Common free time':
+        batches = panel.multiselect('Batches', index.resources('batch'), default=index.resources('batch')[:2],
+                                    key=f'{key}_batches')
+        faculty = panel.multiselect('Faculty', index.resources('faculty'), key=f'{key}_faculty')
+        min_minutes = panel.slider('Minimum length (minutes)', 0, 180, 30, step=15, key=f'{key}_min')
+        resources = [('batch', b) for b in batches] + [('faculty', f) for f in faculty]
+        st.subheader(f'🕒 Common free time on {day}')
+        windows = index.common_free_windows(resources, day, min_minutes) if resources else []
+        if windows:
+            st.dataframe(pd.DataFrame(windows, columns=['From', 'To']), use_container_width=True)
+        else:
+            st.info('No common free window found.')
+
+    elif query == 'Free rooms':
+        start = panel.time_input('From', value=time(14, 0), step=900, key=f'{key}_from')
+        end = panel.time_input('To', value=time(15, 30), step=900, key=f'{key}_to')
+        min_capacity = panel.number_input('Minimum capacity', min_value=0, value=0, step=5, key=f'{key}_capacity')
+        projector = panel.checkbox('Needs projector', key=f'{key}_projector')
+        lab = panel.checkbox('Needs lab', key=f'{key}_lab')
+        st.subheader(f'🏢 Rooms free on {day}, {start:%H:%M}-{end:%H:%M}')
+        if end <= start:
+            st.error('The end time must be after the start time.')
+            return
+        rooms = index.free_rooms(day, start, end, min_capacity=min_capacity, projector=projector, lab=lab)
+        if rooms:
+            st.dataframe(pd.DataFrame({
+                'Room': rooms,
+                'Capacity': [index.rooms.get(room, {}).get('capacity') for room in rooms],
+            }), use_container_width=True)
+        else:
+            st.info('No matching room is free for the whole window.')
+
+    else:
+        kind = panel.selectbox('Resource type', ['faculty', 'batch', 'room'], key=f'{key}_kind')
+        name = panel.selectbox('Resource', index.resources(kind), key=f'{key}_name')
+        if name is None:
+            st.info(f'No {kind} in this timetable.')
+            return
+        st.subheader(f'📆 {name} on {day}')
+        col1, col2 = st.columns(2)
+        with col1:
+            st.caption('Free')
+            st.dataframe(pd.DataFrame(index.free_windows(kind, name, day), columns=['From', 'To']), use_container_width=True)
+        with col2:
+            st.caption('Busy')
+            st.dataframe(pd.DataFrame(index.busy(kind, name, day), columns=['From', 'To']), use_container_width=True)
+
+
 # Main Streamlit App
 def main():
     st.set_page_config(page_title='Timetable Dashboard', layout='wide')
@@ -291,13 +567,18 @@ def main():
     st.caption('Advanced schedule management system with realistic course data')
 
     st.sidebar.header('Quick Controls')
-    mode = st.sidebar.selectbox('Mode', ['Student view (static)', 'Auto-scheduler (generate)'])
+    mode = st.sidebar.selectbox('Mode', ['Student view (static)', 'Free-slot finder (static)', 'Auto-scheduler (generate)'])
 
     if mode == 'Student view (static)':
         st.sidebar.write('Displaying timetable with realistic course data based on university schedule.')
         student_tt = StudentTimetable()
         student_list = list(student_tt.students.keys())
         student = st.sidebar.selectbox('Select student/batch', student_list)
+        with st.sidebar.expander('Semester calendar'):
+            sem_start = st.date_input('Semester start', value=date.today())
+            sem_end = st.date_input('Semester end', value=date.today() + timedelta(weeks=16))
+            holidays = st.multiselect('Holidays', [sem_start + timedelta(days=i) for i in range((sem_end - sem_start).days + 1)])
+            exam_week = st.date_input('Exam week (any day)', value=None)
         
         if st.sidebar.button('Show timetable'):
             df = student_tt.get_student_timetable(student)
@@ -319,17 +600,45 @@ def main():
                 
                 csv = df.to_csv(index=False)
                 st.download_button('📥 Download CSV', csv, file_name=f'{student}_timetable.csv', mime='text/csv')
+
+                semester = SemesterCalendar(sem_start, sem_end, holidays=holidays,
+                                            exam_weeks=[exam_week] if exam_week else [])
+                events = weekly_events_from_student_timetable(student_tt)
+                col1, col2 = st.columns(2)
+                with col1:
+                    buf = StringIO()
+                    write_occurrences_csv(semester.occurrences(events, batch=student, enrolled_only=True), buf)
+                    st.download_button('📥 Semester CSV', buf.getvalue(), file_name=f'{student}_semester.csv', mime='text/csv')
+                with col2:
+                    buf = StringIO()
+                    write_occurrences_ics(semester.occurrences(events, batch=student, enrolled_only=True), buf,
+                                          calendar_name=student)
+                    st.download_button('📅 Semester iCalendar', buf.getvalue(), file_name=f'{student}_semester.ics', mime='text/calendar')
             else:
                 st.info("No classes scheduled for this batch.")
 
+    elif mode == 'Free-slot finder (static)':
+        st.sidebar.write('Find free time for batches, faculty and rooms in the static timetable.')
+        index = load_static_availability()
+        render_availability_queries(index, ['MON', 'TUE', 'WED', 'THU', 'FRI'], st.sidebar, key='static')
+
     else:
         st.sidebar.write('Auto-generate a timetable with constraints (experimental).')
+        large_instance = st.sidebar.checkbox('Large-instance mode', value=False,
+                                             help='Allows institution-sized inputs and searches identical rooms once per room type.')
+        scale = 50 if large_instance else 1
+        candidate_search = st.sidebar.selectbox(
+            'Candidate search', list(TimetableScheduler.CANDIDATE_SEARCH_MODES),
+            help='exhaustive lists every valid slot; reservoir draws one uniformly from free-room counts; first_k stops early after k candidates.')
+        candidate_k = 8
+        if candidate_search == 'first_k':
+            candidate_k = st.sidebar.slider('Candidates to sample (k)', 1, 64, 8)
         days = st.sidebar.slider('Working days', 3, 5, 5)
         slots_per_day = st.sidebar.slider('Slots per day (30-min)', 6, 20, 12)
-        rooms = st.sidebar.slider('Number of rooms', 2, 8, 4)
-        faculties = st.sidebar.slider('Number of faculties', 1, 8, 4)
-        courses = st.sidebar.slider('Number of courses', 1, 12, 6)
-        groups = st.sidebar.slider('Number of student groups', 1, 6, 3)
+        rooms = st.sidebar.slider('Number of rooms', 2, 8 * scale, 4)
+        faculties = st.sidebar.slider('Number of faculties', 1, 8 * scale, 4)
+        courses = st.sidebar.slider('Number of courses', 1, 12 * scale, 6)
+        groups = st.sidebar.slider('Number of student groups', 1, 6 * scale, 3)
         seed = st.sidebar.number_input('Random seed (optional)', value=42)
 
         if st.sidebar.button('Generate timetable'):
@@ -341,11 +650,18 @@ def main():
                     faculties=faculties, 
                     courses=courses, 
                     groups=groups, 
-                    seed=int(seed)
+                    seed=int(seed),
+                    large_instance=large_instance,
+                    candidate_search=candidate_search,
+                    candidate_k=candidate_k
                 )
                 sched.generate_timetable()
-
+            # Keep the schedule across reruns so the inspection widgets below stay usable
+            st.session_state['generated_schedule'] = sched
             st.success('✅ Generation complete')
+
+        sched = st.session_state.get('generated_schedule')
+        if sched is not None:
             st.subheader('📊 Scheduled Classes')
             
             if sched.scheduled_classes:
@@ -359,11 +675,11 @@ def main():
                     st.metric("Total Classes", len(df))
                 with col2:
                     st.metric("Avg per Day", f"{len(df)/sched.days:.1f}")
+                stats = sched.analytics()
                 with col3:
-                    utilization = (len(df) / (sched.days * sched.slots * sched.num_rooms)) * 100
-                    st.metric("Room Utilization", f"{utilization:.1f}%")
+                    st.metric("Room Utilization", f"{stats['overall_utilization'] * 100:.1f}%")
                 with col4:
-                    st.metric("Active Faculties", (sched.faculty_workload > 0).sum())
+                    st.metric("Active Faculties", int((stats['faculty_hours'] > 0).sum()))
 
                 # Export sorted CSV
                 csv = df.to_csv(index=False)
@@ -383,8 +699,47 @@ def main():
                 plt.tight_layout()
                 st.pyplot(fig)
 
+                st.subheader('📈 Schedule Analytics')
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Peak Concurrency", f"{stats['peak_concurrency']}/{sched.num_rooms} rooms")
+                with col2:
+                    if stats['peak_at'] is None:
+                        st.metric("Peak At", "—")
+                    else:
+                        peak_day, peak_slot = stats['peak_at']
+                        st.metric("Peak At", f"{sched.day_names[peak_day][:3]} {9 + peak_slot//2:02d}:{'00' if peak_slot%2==0 else '30'}")
+                with col3:
+                    st.metric("Group Idle Hours", f"{stats['group_idle_slots'].sum() * stats['slot_hours']:.1f}")
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    ru = pd.DataFrame({
+                        'Room': sched.room_names,
+                        'Hours': stats['room_slots'] * stats['slot_hours'],
+                        'Utilization %': np.round(stats['room_utilization'] * 100, 1),
+                    })
+                    st.dataframe(ru, use_container_width=True)
+                with col2:
+                    gu = pd.DataFrame({
+                        'Group': sched.group_names,
+                        'Hours': stats['group_hours'],
+                        'Utilization %': np.round(stats['group_utilization'] * 100, 1),
+                        'Idle Hours': stats['group_idle_slots'].sum(axis=1) * stats['slot_hours'],
+                        'Gaps': stats['group_gap_count'].sum(axis=1),
+                    })
+                    st.dataframe(gu, use_container_width=True)
+
+                load = pd.DataFrame(
+                    stats['day_load'].T,
+                    index=[f"{9 + s//2:02d}:{'00' if s%2==0 else '30'}" for s in range(sched.slots)],
+                    columns=sched.day_names,
+                )
+                st.caption('Rooms in use per slot (daily load curves)')
+                st.line_chart(load)
+
                 st.subheader('👨‍🏫 Faculty Workload Distribution')
-                fw = pd.DataFrame({'Faculty': sched.faculty_names, 'Hours': np.round(sched.faculty_workload, 2)})
+                fw = pd.DataFrame({'Faculty': sched.faculty_names, 'Hours': np.round(stats['faculty_hours'], 2)})
                 fw = fw.sort_values('Hours', ascending=False).reset_index(drop=True)
                 
                 col1, col2 = st.columns([1, 2])
@@ -397,12 +752,15 @@ def main():
                     ax2.set_title('Faculty Teaching Hours')
                     plt.tight_layout()
                     st.pyplot(fig2)
+
+                st.subheader('🔎 Availability Finder')
+                render_availability_queries(sched.availability_index(), sched.day_names, st, key='generated')
             else:
                 st.warning('⚠️ No classes could be scheduled. Try adjusting parameters or seed.')
 
     st.markdown('---')
     st.markdown('**How to run:** `streamlit run app.py`')
-    st.markdown('**Features:** Student static view • Auto-scheduler • Visual matrix • Faculty analytics • CSV export')
+    st.markdown('**Features:** Student static view • Free-slot finder • Auto-scheduler • Visual matrix • Faculty analytics • CSV export')
 
 
 if __name__ == "__main__":
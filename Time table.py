@@ -1,9 +1,10 @@
 import numpy as np
 from typing import List, Dict, Tuple
-import random
+
+from Schedule_analytics import compute_schedule_analytics
 
 class TimetableScheduler:
-    def __init__(self, days=5, slots_per_day=12, rooms=4, faculties=4, courses=6, groups=3):
+    def __init__(self, days=5, slots_per_day=12, rooms=4, faculties=4, courses=6, groups=3, seed=None):
         """
         Initialize the multi-dimensional timetable scheduler.
         
@@ -14,6 +15,7 @@ class TimetableScheduler:
         - faculties: Number of faculty members
         - courses: Number of courses to schedule
         - groups: Number of student groups/batches
+        - seed: Seed for this scheduler's own random generator (None = unseeded)
         """
         self.days = days
         self.slots = slots_per_day
@@ -22,6 +24,10 @@ class TimetableScheduler:
         self.num_courses = courses
         self.num_groups = groups
         
+        # Per-instance random generator (never touches the global np.random state)
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        
         # Names for display
         self.day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'][:days]
         self.room_names = [f'Room {chr(65+i)}' for i in range(rooms)]
@@ -38,14 +44,20 @@ class TimetableScheduler:
         # BASE SCHEDULE: [Days × Slots × Rooms] - 0 = free, 1 = occupied
         self.schedule = np.zeros((self.days, self.slots, self.num_rooms), dtype=int)
         
+        # GROUP SCHEDULE: [Groups × Days × Slots] - 1 = group is in class
+        self.group_schedule = np.zeros((self.num_groups, self.days, self.slots), dtype=int)
+        
+        # ANALYTICS CACHE: recomputed lazily after the schedule changes
+        self._analytics = None
+        
         # FACULTY AVAILABILITY: [Faculties × Days × Slots] - 1 = available, 0 = busy
         # Randomly generate availability (80% available)
-        self.faculty_availability = np.random.choice([0, 1], 
+        self.faculty_availability = self.rng.choice([0, 1], 
                                                      size=(self.num_faculties, self.days, self.slots),
                                                      p=[0.2, 0.8])
         
         # STUDENT GROUP AVAILABILITY: [Groups × Days × Slots] - 1 = available, 0 = busy
-        self.group_availability = np.random.choice([0, 1],
+        self.group_availability = self.rng.choice([0, 1],
                                                    size=(self.num_groups, self.days, self.slots),
                                                    p=[0.15, 0.85])
         
@@ -70,16 +82,16 @@ class TimetableScheduler:
         ])
         
         # FACULTY-COURSE MAPPING: [Faculties × Courses] - 1 = can teach, 0 = cannot
-        self.faculty_course_mapping = np.random.choice([0, 1],
+        self.faculty_course_mapping = self.rng.choice([0, 1],
                                                        size=(self.num_faculties, self.num_courses),
                                                        p=[0.3, 0.7])
         # Ensure each course has at least one faculty
         for c in range(self.num_courses):
             if self.faculty_course_mapping[:, c].sum() == 0:
-                self.faculty_course_mapping[random.randint(0, self.num_faculties-1), c] = 1
+                self.faculty_course_mapping[self.rng.integers(self.num_faculties), c] = 1
         
         # COURSE-GROUP MAPPING: [Courses × Groups] - hours needed per week
-        self.course_group_needs = np.random.randint(2, 6, size=(self.num_courses, self.num_groups))
+        self.course_group_needs = self.rng.integers(2, 6, size=(self.num_courses, self.num_groups))
         
         # FACULTY WORKLOAD TRACKER: [Faculties] - hours scheduled
         self.faculty_workload = np.zeros(self.num_faculties)
@@ -151,6 +163,10 @@ class TimetableScheduler:
         
         # Update group availability (mark as busy)
         self.group_availability[group_idx, day, start_slot:start_slot+duration] = 0
+        self.group_schedule[group_idx, day, start_slot:start_slot+duration] = 1
+        
+        # Invalidate cached analytics
+        self._analytics = None
         
         # Update faculty workload
         self.faculty_workload[faculty_idx] += duration * 0.5  # Convert slots to hours
@@ -205,7 +221,7 @@ class TimetableScheduler:
                     
                     if valid_slots:
                         # Pick a random valid slot
-                        day, start_slot, room = random.choice(valid_slots)
+                        day, start_slot, room = valid_slots[self.rng.integers(len(valid_slots))]
                         
                         # Schedule the class
                         self.schedule_class(faculty_idx, group_idx, course_idx, 
@@ -237,26 +253,50 @@ class TimetableScheduler:
             print(f"   Time: {cls['day']}, {start_time} - {end_time}")
             print(f"   Room: {cls['room']}")
     
+    def analytics(self) -> Dict:
+        """Utilization, load and gap metrics, computed once per schedule and cached"""
+        if self._analytics is None:
+            self._analytics = compute_schedule_analytics(self.schedule, self.group_schedule, self.num_faculties)
+        return self._analytics
+    
     def print_matrix_stats(self):
         """Print statistics about the matrices"""
+        stats = self.analytics()
+        total = self.days * self.slots
+        
         print("\n" + "=" * 80)
         print("MATRIX STATISTICS".center(80))
         print("=" * 80)
         
         print(f"\n📊 Schedule Matrix Shape: {self.schedule.shape}")
-        print(f"   Total slots: {self.schedule.size}")
-        print(f"   Occupied slots: {np.sum(self.schedule > 0)}")
-        print(f"   Utilization: {np.sum(self.schedule > 0) / self.schedule.size * 100:.1f}%")
+        print(f"   Total slots: {stats['total_slots']}")
+        print(f"   Occupied slots: {stats['occupied_slots']}")
+        print(f"   Utilization: {stats['overall_utilization'] * 100:.1f}%")
+        if stats['peak_at'] is not None:
+            peak_day, peak_slot = stats['peak_at']
+            print(f"   Peak concurrency: {stats['peak_concurrency']} rooms "
+                  f"({self.day_names[peak_day]} {9 + peak_slot//2}:{('00' if peak_slot%2==0 else '30')})")
         
         print(f"\n👨‍🏫 Faculty Workload (hours per week):")
         for i, name in enumerate(self.faculty_names):
-            print(f"   {name}: {self.faculty_workload[i]:.1f} hours")
+            idle = stats['faculty_idle_slots'][i].sum() * stats['slot_hours']
+            print(f"   {name}: {stats['faculty_hours'][i]:.1f} hours, {idle:.1f} idle")
         
         print(f"\n🏫 Room Utilization:")
         for i, name in enumerate(self.room_names):
-            occupied = np.sum(self.schedule[:, :, i] > 0)
-            total = self.days * self.slots
-            print(f"   {name}: {occupied}/{total} slots ({occupied/total*100:.1f}%)")
+            occupied = stats['room_slots'][i]
+            print(f"   {name}: {occupied}/{total} slots ({stats['room_utilization'][i]*100:.1f}%)")
+        
+        print(f"\n👥 Group Load:")
+        for i, name in enumerate(self.group_names):
+            idle = stats['group_idle_slots'][i].sum() * stats['slot_hours']
+            gaps = stats['group_gap_count'][i].sum()
+            print(f"   {name}: {stats['group_hours'][i]:.1f} hours "
+                  f"({stats['group_utilization'][i]*100:.1f}%), {idle:.1f} idle hours in {gaps} gaps")
+        
+        print(f"\n📆 Daily Load (room-hours):")
+        for d, name in enumerate(self.day_names):
+            print(f"   {name}: {stats['daily_hours'][d]:.1f}")
     
     def export_schedule_matrix(self, day: int = 0):
         """Export schedule matrix for a specific day for visualization"""